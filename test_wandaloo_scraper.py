@@ -0,0 +1,186 @@
+import json
+import os
+
+import pytest
+
+import wandaloo_scraper
+from wandaloo_scraper import ScrapeStats
+
+
+SAMPLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'enhanced_wandaloo_cars.json')
+
+
+RECORDS = [
+    {
+        'page': 1,
+        'car_name': 'Dacia Logan',
+        'url': 'https://www.wandaloo.com/neuf/dacia/logan/fiche-technique/1-0/1.html',
+        'images': ['a.jpg', 'b.jpg'],
+        'specifications': {
+            'Moteur & Infos techniques': {'Energie': 'Essence', 'Cylindree': '#'},
+            'Confort': {'Climatisation': 'OUI', 'value': 'litre'},
+        },
+    },
+    {
+        'page': 1,
+        'car_name': 'Land Rover Defender',
+        'url': 'https://www.wandaloo.com/neuf/land-rover/defender/fiche-technique/d250/2.html',
+        'images': [],
+        'specifications': {
+            'Moteur & Infos techniques': {'Energie': '#', 'Cylindree': '#'},
+            'Confort': {},
+        },
+    },
+    {
+        'page': 2,
+        'car_name': 'Renault Clio',
+        'images': ['c.jpg'],
+        'specifications': {
+            'Moteur & Infos techniques': {'Energie': 'Diesel', 'Cylindree': '1461cm³'},
+            'Confort': {'value': 'litre'},
+        },
+    },
+]
+
+
+def write(tmp_path, text):
+    path = tmp_path / 'data.json'
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 100, 65536])
+def test_add_file_matches_full_load(chunk_size):
+    streamed = ScrapeStats()
+    streamed.add_file(SAMPLE_FILE, chunk_size=chunk_size)
+
+    loaded = ScrapeStats()
+    with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
+        for item in json.load(f):
+            loaded.add(item)
+
+    streamed_report = streamed.to_dict()
+    loaded_report = loaded.to_dict()
+    del streamed_report['generated_at'], loaded_report['generated_at']
+    assert streamed_report == loaded_report
+    assert streamed.records > 0
+
+
+@pytest.mark.parametrize('text, records', [
+    ('[]', 0),
+    (' \n[ ]\n ', 0),
+    ('[{"page": 1}]', 1),
+    ('[ {"page": 1} ,\n {"page": 2} ]\n', 2),
+])
+def test_add_file_valid(tmp_path, text, records):
+    stats = ScrapeStats()
+    stats.add_file(write(tmp_path, text), chunk_size=3)
+    assert stats.records == records
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    '{"page": 1}',
+    '[{"page": 1} {"page": 2}]',
+    '[,,{"page": 1}]',
+    '[{"page": 1},]',
+    '[{"page": 1},,{"page": 2}]',
+    '[{"page": 1}] trailing',
+    '[{"page": 1}][]',
+    '[{"page": 1},',
+    '[{"page": 1',
+    '[{"page": tru}]',
+    '[1, 2]',
+    '[[{"page": 1}]]',
+])
+@pytest.mark.parametrize('chunk_size', [1, 5, 65536])
+def test_add_file_malformed(tmp_path, text, chunk_size):
+    with pytest.raises(ValueError):
+        ScrapeStats().add_file(write(tmp_path, text), chunk_size=chunk_size)
+
+
+def test_add_file_stops_at_syntax_error(tmp_path, monkeypatch):
+    records = ',\n'.join(json.dumps({'page': i, 'car_name': 'Dacia Logan'}) for i in range(20000))
+    path = write(tmp_path, '[{"page": 1} x,\n' + records + ']')
+
+    read_sizes = []
+    real_open = open
+
+    class CountingFile:
+        def __init__(self, f):
+            self.f = f
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.f.close()
+
+        def read(self, size):
+            chunk = self.f.read(size)
+            read_sizes.append(len(chunk))
+            return chunk
+
+    monkeypatch.setattr(wandaloo_scraper, 'open', lambda *a, **kw: CountingFile(real_open(*a, **kw)), raising=False)
+
+    with pytest.raises(ValueError):
+        ScrapeStats().add_file(path, chunk_size=100)
+    assert sum(read_sizes) <= 200
+
+
+def test_unparsed_values_report_overestimate():
+    stats = ScrapeStats(max_tracked_values=2)
+    for value in ['a', 'a', 'b', 'c']:
+        stats.add({'specifications': {'Confort': {'value': value}}})
+
+    entries = {entry['value']: entry for entry in stats.to_dict()['unparsed_values']}
+    assert entries['a'] == {'value': 'a', 'count': 2, 'max_overestimate': 0}
+    assert entries['c'] == {'value': 'c', 'count': 2, 'max_overestimate': 1}
+    assert 'b' not in entries
+
+
+def test_get_brand():
+    assert ScrapeStats.get_brand(RECORDS[1]) == 'land-rover'
+    assert ScrapeStats.get_brand(RECORDS[2]) == 'renault'
+    assert ScrapeStats.get_brand({}) == 'Unknown'
+
+
+def test_aggregates():
+    stats = ScrapeStats()
+    for item in RECORDS:
+        stats.add(item)
+    report = stats.to_dict()
+
+    assert report['records'] == 3
+    assert report['pages'] == {'1': 2, '2': 1}
+    assert report['brands'] == {'dacia': 1, 'land-rover': 1, 'renault': 1}
+    assert report['images'] == {'total': 3, 'models_with_images': 2, 'coverage': 0.6667}
+    assert report['sections'] == {
+        'Moteur & Infos techniques': {'records': 3, 'fill_rate': 1.0, 'values': 6, 'placeholder_rate': 0.5},
+        'Confort': {'records': 2, 'fill_rate': 0.6667, 'values': 3, 'placeholder_rate': 0.0},
+    }
+    assert report['placeholders'] == {
+        'Confort / Climatisation': {'values': 1, 'placeholders': 0, 'share': 0.0},
+        'Confort / value': {'values': 2, 'placeholders': 0, 'share': 0.0},
+        'Moteur & Infos techniques / Cylindree': {'values': 3, 'placeholders': 2, 'share': 0.6667},
+        'Moteur & Infos techniques / Energie': {'values': 3, 'placeholders': 1, 'share': 0.3333},
+    }
+    assert report['unparsed_values'] == [{'value': 'litre', 'count': 2, 'max_overestimate': 0}]
+
+
+def test_interval_report(tmp_path):
+    report_file = tmp_path / 'report.json'
+    stats = ScrapeStats(report_file=str(report_file), report_interval=0)
+    stats.add(RECORDS[0])
+    stats.add(RECORDS[1])
+
+    with open(report_file, 'r', encoding='utf-8') as f:
+        assert json.load(f)['records'] == 2
+
+
+def test_report_write_failure_does_not_raise(tmp_path):
+    stats = ScrapeStats(report_file=str(tmp_path / 'missing' / 'report.json'), report_interval=0)
+    stats.add(RECORDS[0])
+
+    assert stats.records == 1
+    assert stats.write_report() is False
@@ -11,10 +11,256 @@ import csv
 import time
 import re
 import argparse
+import os
+from collections import Counter
 from urllib.parse import urljoin, urlparse
 import pandas as pd
 from datetime import datetime
 
+class ScrapeStats:
+    """Incremental summary and data-quality report, fed one record at a time"""
+
+    JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+    def __init__(self, report_file=None, report_interval=60, top_values=10, max_tracked_values=200):
+        self.report_file = report_file
+        self.report_interval = report_interval
+        self.top_values = top_values
+        self.max_tracked_values = max_tracked_values
+
+        self.records = 0
+        self.page_counts = Counter()
+        self.brand_counts = Counter()
+        self.total_images = 0
+        self.models_with_images = 0
+        self.section_records = Counter()
+        self.section_values = Counter()
+        self.section_placeholders = Counter()
+        self.key_values = Counter()
+        self.key_placeholders = Counter()
+        self.unparsed_values = Counter()
+        self.unparsed_errors = {}
+
+        self.last_report_time = time.monotonic()
+
+    @staticmethod
+    def get_brand(item):
+        """Get the brand slug from the model URL, falling back to the car name"""
+        path = urlparse(item.get('url', '')).path.strip('/').split('/')
+        if len(path) > 1 and path[0] == 'neuf':
+            return path[1]
+        car_name = item.get('car_name', '').split()
+        return car_name[0].lower() if car_name else 'Unknown'
+
+    def count_unparsed_value(self, value):
+        """Count a fallback value while keeping at most max_tracked_values entries"""
+        if value in self.unparsed_values or len(self.unparsed_values) < self.max_tracked_values:
+            self.unparsed_values[value] += 1
+            return
+
+        # Space-saving eviction: the new value inherits the smallest count,
+        # which is remembered as the most its count can be overestimated by
+        min_value = min(self.unparsed_values, key=self.unparsed_values.get)
+        min_count = self.unparsed_values.pop(min_value)
+        self.unparsed_errors.pop(min_value, None)
+        self.unparsed_values[value] = min_count + 1
+        self.unparsed_errors[value] = min_count
+
+    def add(self, item):
+        """Update all counters with a single scraped record"""
+        self.records += 1
+        self.page_counts[str(item.get('page', 'Unknown'))] += 1
+        self.brand_counts[self.get_brand(item)] += 1
+
+        images = item.get('images') or []
+        self.total_images += len(images)
+        if images:
+            self.models_with_images += 1
+
+        specifications = item.get('specifications') or {}
+        if isinstance(specifications, dict):
+            for section_name, section_specs in specifications.items():
+                if not section_specs:
+                    continue
+                self.section_records[section_name] += 1
+
+                if not isinstance(section_specs, dict):
+                    continue
+                for spec_key, spec_value in section_specs.items():
+                    full_key = f"{section_name} / {spec_key}"
+                    self.section_values[section_name] += 1
+                    self.key_values[full_key] += 1
+                    if not spec_value or spec_value == "#":
+                        self.section_placeholders[section_name] += 1
+                        self.key_placeholders[full_key] += 1
+                    elif spec_key == 'value':
+                        self.count_unparsed_value(str(spec_value))
+
+        if self.report_file and time.monotonic() - self.last_report_time >= self.report_interval:
+            self.write_report()
+
+    def add_file(self, filename, chunk_size=65536, max_record_size=16 * 1024 * 1024):
+        """Feed every record of an existing JSON output file, one at a time"""
+        decoder = json.JSONDecoder()
+        with open(filename, 'r', encoding='utf-8') as f:
+            buffer = ''
+            idx = 0
+            eof = False
+            # start -> first -> (value -> separator)* -> end
+            state = 'start'
+            while True:
+                idx = self.JSON_WHITESPACE.match(buffer, idx).end()
+                if idx == len(buffer):
+                    if eof:
+                        break
+                    chunk = f.read(chunk_size)
+                    eof = not chunk
+                    buffer = chunk
+                    idx = 0
+                    continue
+
+                char = buffer[idx]
+                if state == 'start':
+                    if char != '[':
+                        raise ValueError(f"{filename} does not contain a JSON list of records")
+                    idx += 1
+                    state = 'first'
+                elif state == 'end':
+                    raise ValueError(f"{filename} has unexpected data after the JSON list")
+                elif state in ('first', 'separator') and char == ']':
+                    idx += 1
+                    state = 'end'
+                elif state == 'separator':
+                    if char != ',':
+                        raise ValueError(f"{filename} is missing a ',' between records")
+                    idx += 1
+                    state = 'value'
+                else:
+                    try:
+                        item, idx = decoder.raw_decode(buffer, idx)
+                    except json.JSONDecodeError as e:
+                        # Only a truncated record (error at the end of the buffer) needs more input
+                        incomplete = e.msg.startswith('Unterminated string') or e.pos >= len(buffer) - 16
+                        if eof or not incomplete:
+                            raise ValueError(f"{filename} is not valid JSON: {e}") from e
+                        if len(buffer) - idx > max_record_size:
+                            raise ValueError(f"{filename} has a record larger than {max_record_size} characters")
+                        chunk = f.read(chunk_size)
+                        eof = not chunk
+                        buffer = buffer[idx:] + chunk
+                        idx = 0
+                        continue
+
+                    if not isinstance(item, dict):
+                        raise ValueError(f"{filename} contains a record that is not an object: {str(item)[:50]!r}")
+                    self.add(item)
+                    state = 'separator'
+
+            if state != 'end':
+                raise ValueError(f"{filename} ended before the JSON list was closed")
+
+    def to_dict(self):
+        """Build the JSON-serializable report"""
+        records = self.records or 1
+
+        sections = {}
+        for section_name, count in self.section_records.most_common():
+            values = self.section_values[section_name]
+            sections[section_name] = {
+                'records': count,
+                'fill_rate': round(count / records, 4),
+                'values': values,
+                'placeholder_rate': round(self.section_placeholders[section_name] / values, 4) if values else 0.0,
+            }
+
+        placeholders = {}
+        for full_key, total in sorted(self.key_values.items()):
+            placeholders[full_key] = {
+                'values': total,
+                'placeholders': self.key_placeholders[full_key],
+                'share': round(self.key_placeholders[full_key] / total, 4),
+            }
+
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'records': self.records,
+            'pages': dict(sorted(self.page_counts.items(), key=lambda kv: (len(kv[0]), kv[0]))),
+            'brands': dict(self.brand_counts.most_common()),
+            'images': {
+                'total': self.total_images,
+                'models_with_images': self.models_with_images,
+                'coverage': round(self.models_with_images / records, 4),
+            },
+            'sections': sections,
+            'placeholders': placeholders,
+            'unparsed_values': [
+                {'value': value, 'count': count, 'max_overestimate': self.unparsed_errors.get(value, 0)}
+                for value, count in self.unparsed_values.most_common(self.top_values)
+            ],
+        }
+
+    def write_report(self, filename=None):
+        """Write the current report to a JSON file, replacing it atomically"""
+        filename = filename or self.report_file
+        if not filename:
+            return
+
+        # Reset the schedule even on failure so a bad path is not retried on every record
+        self.last_report_time = time.monotonic()
+        tmp_filename = f"{filename}.tmp"
+        try:
+            with open(tmp_filename, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            os.replace(tmp_filename, filename)
+        except OSError as e:
+            print(f"❌ Error writing report {filename}: {e}")
+            return False
+        print(f"📝 Report written to {filename} ({self.records} records)")
+        return True
+
+    def print_summary(self):
+        """Print a summary of the records seen so far"""
+        if not self.records:
+            return
+
+        report = self.to_dict()
+
+        print("\n" + "="*50)
+        print("📈 ENHANCED SCRAPING SUMMARY")
+        print("="*50)
+
+        print(f"📄 Models by page:")
+        for page, count in report['pages'].items():
+            print(f"   • Page {page}: {count} models")
+
+        print(f"\n🏷️  Models by brand:")
+        for brand, count in report['brands'].items():
+            print(f"   • {brand}: {count} models")
+
+        print(f"\n🖼️  Images:")
+        print(f"   • Total images found: {report['images']['total']}")
+        print(f"   • Models with images: {report['images']['models_with_images']}/{self.records}")
+
+        print(f"\n📊 Specifications:")
+        print(f"   • Sections found: {len(report['sections'])}")
+        print(f"   • Unique spec keys: {len(report['placeholders'])}")
+        for section_name, section in report['sections'].items():
+            print(f"   • {section_name}: {section['fill_rate']:.0%} filled, "
+                  f"{section['placeholder_rate']:.0%} '#' values")
+
+        worst_keys = sorted(report['placeholders'].items(), key=lambda kv: kv[1]['share'], reverse=True)
+        worst_keys = [(key, stats) for key, stats in worst_keys if stats['placeholders']][:5]
+        if worst_keys:
+            print(f"\n⚠️  Most '#' placeholders:")
+            for full_key, stats in worst_keys:
+                print(f"   • {full_key}: {stats['share']:.0%} ({stats['placeholders']}/{stats['values']})")
+
+        if report['unparsed_values']:
+            print(f"\n❓ Most common unparsed values:")
+            for entry in report['unparsed_values']:
+                overestimate = f" (may be over by {entry['max_overestimate']})" if entry['max_overestimate'] else ""
+                print(f"   • {entry['value']!r}: {entry['count']}{overestimate}")
+
 class EnhancedWandalooScraper:
     def __init__(self, delay=2):
         self.base_url = "https://www.wandaloo.com"
@@ -474,8 +720,8 @@ class EnhancedWandalooScraper:
         
         return details
     
-    def scrape_pages(self, num_pages=None):
-        """Scrape car models from specified number of pages"""
+    def scrape_pages(self, num_pages=None, stats=None):
+        """Scrape car models from specified number of pages, feeding each record to stats"""
         print("🚀 STARTING ENHANCED WANDALOO CAR SCRAPER")
         print("="*50)
         
@@ -517,6 +763,8 @@ class EnhancedWandalooScraper:
             if details:
                 final_model = {**model, **details}
                 detailed_models.append(final_model)
+                if stats is not None:
+                    stats.add(final_model)
                 
                 print(f"✅ SUCCESS: {details.get('name', '#')}")
                 print(f"   💰 Price: {details.get('prix', '#')}")
@@ -580,66 +828,44 @@ class EnhancedWandalooScraper:
         df.to_csv(filename, index=False, encoding='utf-8')
         print(f"💾 CSV data saved to {filename}")
     
-    def print_summary(self, data):
-        """Print a summary of scraped data"""
-        if not data:
-            return
-        
-        print("\n" + "="*50) 
-        print("📈 ENHANCED SCRAPING SUMMARY")
-        print("="*50)
-        
-        # Count by page
-        page_counts = {}
-        for item in data:
-            page = item.get('page', 'Unknown')
-            page_counts[page] = page_counts.get(page, 0) + 1
-        
-        print(f"📄 Models by page:")
-        for page, count in sorted(page_counts.items()):
-            print(f"   • Page {page}: {count} models")
-        
-        # Images summary
-        total_images = sum(len(item.get('images', [])) for item in data)
-        models_with_images = len([item for item in data if item.get('images')])
-        
-        print(f"\n🖼️  Images:")
-        print(f"   • Total images found: {total_images}")
-        print(f"   • Models with images: {models_with_images}/{len(data)}")
-        
-        # Specifications summary
-        all_sections = set()
-        all_spec_keys = set()
-        for item in data:
-            if 'specifications' in item:
-                all_sections.update(item['specifications'].keys())
-                for section_specs in item['specifications'].values():
-                    if isinstance(section_specs, dict):
-                        all_spec_keys.update(section_specs.keys())
-        
-        print(f"\n📊 Specifications:")
-        print(f"   • Sections found: {len(all_sections)}")
-        print(f"   • Unique spec keys: {len(all_spec_keys)}")
-        print(f"   • Sample sections: {', '.join(list(all_sections)[:3])}...")
-
 def main():
     """Main function to run the enhanced scraper"""
     parser = argparse.ArgumentParser(description='Enhanced Wandaloo Car Scraper with Images and Organized Specs')
     parser.add_argument('--pages', type=int, help='Number of pages to scrape (default: auto-detect all)')
     parser.add_argument('--delay', type=int, default=2, help='Delay between requests in seconds')
     parser.add_argument('--output', type=str, default='enhanced_wandaloo_cars', help='Output filename prefix')
+    parser.add_argument('--report', type=str, help='Write a JSON summary/data-quality report to this file')
+    parser.add_argument('--report-interval', type=int, default=60, help='Seconds between report updates during the crawl')
+    parser.add_argument('--summarize', type=str, help='Only summarize an existing JSON output file, without scraping')
     
     args = parser.parse_args()
     
+    if args.report:
+        report_dir = os.path.dirname(os.path.abspath(args.report))
+        if not os.access(report_dir, os.W_OK):
+            print(f"❌ Report directory is not writable: {report_dir}")
+            return
+    
+    stats = ScrapeStats(report_file=args.report, report_interval=args.report_interval)
+    
+    if args.summarize:
+        try:
+            stats.add_file(args.summarize)
+            stats.write_report()
+        except (OSError, ValueError) as e:
+            print(f"❌ Error summarizing {args.summarize}: {e}")
+            return
+        stats.print_summary()
+        return
+    
     scraper = EnhancedWandalooScraper(delay=args.delay)
     
     try:
-        models_data = scraper.scrape_pages(num_pages=args.pages)
+        models_data = scraper.scrape_pages(num_pages=args.pages, stats=stats)
         
         if models_data:
             scraper.save_to_json(models_data, f'{args.output}.json')
             scraper.save_to_csv(models_data, f'{args.output}.csv')
-            scraper.print_summary(models_data)
         else:
             print("❌ No data to save!")
     
@@ -649,6 +875,14 @@ def main():
         print(f"❌ Error during scraping: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        # Keep the report and summary for whatever was scraped, even on failure
+        if stats.records:
+            try:
+                stats.write_report()
+                stats.print_summary()
+            except Exception as e:
+                print(f"❌ Error writing summary: {e}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file